@@ -13,8 +13,11 @@ load_dotenv()
 
 from .routes import routes  # Import the routes from routes.py
 
+# Shared with the async server in asgi.py
+CORS_ORIGINS = ["http://localhost:8080", "http://localhost:5173", "http://192.168.10.35:8081", "http://localhost:8081"]
+
 app = Flask(__name__)
-CORS(app, origins=["http://localhost:8080", "http://localhost:5173", "http://192.168.10.35:8081", "http://localhost:8081"])  # Allow requests from your Vite app
+CORS(app, origins=CORS_ORIGINS)  # Allow requests from your Vite app
 
 # Register the blueprint for routes
 app.register_blueprint(routes)
@@ -0,0 +1,41 @@
+# asgi.py
+# Async serving mode. Same endpoints as the Flask app, but every request is a
+# coroutine, so one process can keep hundreds of Gemini/embedding calls in flight.
+#
+# Run from the Backend directory with:
+#   uvicorn app.asgi:app --host 0.0.0.0 --port 5000
+# or:
+#   python -m app.asgi
+
+import os
+from quart import Quart
+from quart_cors import cors
+
+from . import CORS_ORIGINS  # Importing the package also loads .env
+from .async_routes import async_routes
+from .services.threadpool import run_blocking
+from .services.vector_db.db_handler import init_async_clients
+
+app = Quart(__name__)
+app = cors(app, allow_origin=CORS_ORIGINS)  # Allow requests from your Vite app
+
+# Register the blueprint for routes
+app.register_blueprint(async_routes)
+
+
+@app.before_serving
+async def open_clients():
+    # Open the Chroma store before the first request instead of on the event loop
+    await run_blocking(init_async_clients)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    if not os.environ.get("GOOGLE_API_KEY"):
+        print("⚠️  WARNING: GOOGLE_API_KEY not found in environment. AI features will be limited.")
+        print("Create a .env file in the Backend directory with: GOOGLE_API_KEY=your_api_key_here")
+    else:
+        print("✅ GOOGLE_API_KEY found in environment")
+
+    uvicorn.run(app, host="0.0.0.0", port=5000)
@@ -0,0 +1,99 @@
+# async_routes.py
+# Async twins of the handlers in routes.py, served by the ASGI app in asgi.py.
+# Gemini and embedding calls are awaited; ChromaDB work and PDF ingestion run on thread pools.
+
+import os
+from quart import Blueprint, request, jsonify
+from app.routes import UPLOAD_FOLDER
+from app.services.process import process_pdf_to_chroma
+from app.services.threadpool import run_ingestion
+from app.services.vector_db.db_handler import query_vector_db_async
+from app.services.analysis_service import analyze_patent_async
+
+async_routes = Blueprint('async_routes', __name__)
+
+
+@async_routes.route("/analyze/<document_id>", methods=["GET"])
+async def analyze(document_id: str):
+    try:
+        if not document_id:
+            return jsonify({"error": "Document ID is required."}), 400
+
+        print(f"📊 Starting analysis for: {document_id}")
+        analysis_result_dict = await analyze_patent_async(document_id)
+
+        if not analysis_result_dict:
+            return jsonify({"error": f"Analysis not found or failed for document ID: {document_id}"}), 404
+
+        print("✅ Analysis completed successfully")
+        return jsonify(analysis_result_dict)
+
+    except Exception as e:
+        print(f"❌ Analysis error: {e}")
+        return jsonify({"error": f"Internal server error during analysis: {str(e)}"}), 500
+
+
+@async_routes.route('/upload', methods=['GET', 'POST'])
+async def upload():
+    if request.method == 'GET':
+        # Handle GET request (frontend navigation)
+        return jsonify({"message": "Upload endpoint ready"}), 200
+
+    # Handle POST request (file upload)
+    files = await request.files
+    file = files.get("file")
+
+    if not file or not file.filename: # Ensure filename exists
+        return jsonify({"error": "No file or filename provided."}), 400
+
+    # Create uploads directory if it doesn't exist
+    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+
+    file_path = os.path.join(UPLOAD_FOLDER, file.filename)
+    await file.save(file_path)
+
+    try:
+        print(f"📤 Processing upload: {file.filename}")
+        # The ingestion pipeline is synchronous end to end, so run it on its own pool
+        document_id = await run_ingestion(process_pdf_to_chroma, file_path)
+        print(f"✅ Upload complete: {document_id}")
+        return jsonify({
+            "message": "PDF uploaded and processed successfully.",
+            "document_id": document_id
+        })
+    except FileNotFoundError as e:
+        print(f"❌ File not found: {e}")
+        return jsonify({"error": f"File processing error: {str(e)}"}), 400
+    except Exception as e:
+        print(f"❌ Processing error: {e}")
+        return jsonify({"error": "Server error during file processing."}), 500
+
+@async_routes.route('/query', methods=['POST'])
+async def query():
+    data = await request.get_json()
+    if data is None:
+        # Quart returns None for a non-JSON body where Flask raises 415
+        return jsonify({"error": "Request body must be JSON."}), 415
+
+    question = data.get("question")
+    document_id = data.get("document_id")  # Get document context if provided
+
+    if not question:
+        return jsonify({"error": "No question provided."}), 400
+
+    try:
+        print(f"💬 Query: {question[:50]}{'...' if len(question) > 50 else ''}")
+        result = await query_vector_db_async(question, document_id)
+
+        if not result or not result.get('answer'):
+            return jsonify({"answer": "I couldn't find any relevant information in the documents.", "sources": []})
+
+        print("✅ Query completed successfully")
+        return jsonify({
+            "answer": result['answer'],
+            "sources": result.get('sources', [])
+        })
+
+    except Exception as e:
+        print(f"❌ Query error: {e}")
+        return jsonify({"error": f"An error occurred while processing your question: {str(e)}"}), 500
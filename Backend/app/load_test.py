@@ -0,0 +1,326 @@
+# load_test.py
+# Compares the sync Flask app with the async ASGI app (asgi.py) under concurrent load.
+#
+# Gemini, the embedding model and ChromaDB are replaced with local fakes that just
+# wait for a fixed latency, so the numbers measure how each serving mode copes with
+# I/O wait rather than the real API. Each fake only implements the methods its real
+# counterpart implements natively; anything else (e.g. LangChain's aembed_*) falls back
+# to the same base-class behaviour as the real client. Run from the Backend directory:
+#   python -m app.load_test --endpoint query --concurrency 200 --latency 0.5
+#
+# By default the sync mode runs exactly as app.run() serves it today: Werkzeug's threaded
+# server with one thread per request (minus the reloader and debugger). Pass
+# --sync-threads N to cap it at a fixed pool of N threads instead, like a production WSGI
+# server (e.g. gunicorn --threads N). The async mode is served by uvicorn in a single
+# process. Every report line includes the peak number of server threads the run used.
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+# analysis_service builds its clients at import time, so a key must be present.
+# Nothing is sent to Google: every client is swapped for a fake below.
+os.environ.setdefault("GOOGLE_API_KEY", "load-test-fake-key")
+
+import google.generativeai as genai
+import requests
+import uvicorn
+from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
+from werkzeug.serving import BaseWSGIServer, make_server
+
+from app import app as flask_app
+from app.asgi import app as asgi_app
+from app.services import analysis_service
+from app.services.vector_db import db_handler
+
+DOCUMENT_ID = "load-test.pdf"
+EMBEDDING = [0.1] * 8
+
+
+# --- Fake backends ---
+
+class FakeEmbeddings(Embeddings):
+    """
+    Stands in for langchain's GoogleGenerativeAIEmbeddings, which is sync only:
+    aembed_query/aembed_documents use the Embeddings base class executor fallback.
+    """
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def embed_query(self, text):
+        time.sleep(self.latency)
+        return EMBEDDING
+
+    def embed_documents(self, texts):
+        time.sleep(self.latency)
+        return [EMBEDDING for _ in texts]
+
+
+def fake_embed_content_async(latency: float):
+    """Stands in for google.generativeai.embed_content_async, which is natively async."""
+    async def embed_content_async(model, content, task_type=None, **kwargs):
+        await asyncio.sleep(latency)
+        if isinstance(content, str):
+            return {"embedding": EMBEDDING}
+        return {"embedding": [EMBEDDING for _ in content]}
+    return embed_content_async
+
+
+class FakeLLM:
+    """Stands in for langchain's GoogleGenerativeAI, which is sync only."""
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def invoke(self, prompt):
+        time.sleep(self.latency)
+        return "This is a fake answer."
+
+
+def _fake_gemini_response(text: str):
+    """Shaped like a GenerateContentResponse: .text plus candidates[].content.parts[]."""
+    part = SimpleNamespace(text=text)
+    candidate = SimpleNamespace(content=SimpleNamespace(parts=[part]))
+    return SimpleNamespace(text=text, candidates=[candidate])
+
+
+class FakeGeminiModel:
+    """Stands in for google.generativeai's GenerativeModel, which is natively async."""
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def generate_content(self, prompt):
+        time.sleep(self.latency)
+        return _fake_gemini_response("- 72")
+
+    async def generate_content_async(self, prompt):
+        await asyncio.sleep(self.latency)
+        return _fake_gemini_response("- 72")
+
+
+def _fake_results():
+    return [
+        (Document(page_content=f"Fake chunk {i}", metadata={"id": f"{DOCUMENT_ID}:0:{i}"}), 0.1 * i)
+        for i in range(5)
+    ]
+
+
+class FakeChroma:
+    """Stands in for langchain_chroma's Chroma. Local vector search is treated as instant."""
+    def __init__(self, persist_directory=None, embedding_function=None):
+        self.embedding_function = embedding_function
+
+    def similarity_search_with_score(self, query, k=4, filter=None):
+        self.embedding_function.embed_query(query)
+        return _fake_results()[:k]
+
+    def similarity_search_by_vector_with_relevance_scores(self, embedding, k=4, filter=None):
+        return _fake_results()[:k]
+
+
+class FakeCollection:
+    """Stands in for the chromadb collection used by analysis_service."""
+    def get(self, where=None):
+        return {
+            "documents": [f"Fake chunk {i}" for i in range(5)],
+            "metadatas": [{"title_pdf": "Load test patent"} for _ in range(5)],
+        }
+
+    def query(self, query_embeddings=None, n_results=5):
+        return {
+            "documents": [[f"Similar patent {i}" for i in range(n_results)]],
+            "metadatas": [[{"id": str(i), "title": f"Patent {i}"} for i in range(n_results)]],
+            "distances": [[0.1 * i for i in range(n_results)]],
+        }
+
+
+def install_fakes(latency: float):
+    """Swap every external client used by both serving modes for a local fake."""
+    db_handler.get_embedding_function = lambda: FakeEmbeddings(latency)
+    db_handler.Chroma = FakeChroma
+    db_handler.GoogleGenerativeAI = lambda model, **kwargs: FakeLLM(latency)
+    db_handler.GenerativeModel = lambda model_name, **kwargs: FakeGeminiModel(latency)
+    db_handler.configure = lambda **kwargs: None
+    db_handler._async_clients = None
+    genai.embed_content_async = fake_embed_content_async(latency)
+
+    analysis_service.model = FakeGeminiModel(latency)
+    analysis_service.embedding_fn = FakeEmbeddings(latency)
+    analysis_service.chroma_connector = SimpleNamespace(collection=FakeCollection())
+
+
+# --- Servers ---
+
+class PooledWSGIServer(BaseWSGIServer):
+    """Werkzeug server that handles requests on a fixed number of worker threads."""
+    def __init__(self, host, port, app, threads: int):
+        super().__init__(host, port, app)
+        self._pool = ThreadPoolExecutor(max_workers=threads)
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+@contextlib.contextmanager
+def serve_sync(port: int, threads: int):
+    if threads:
+        server = PooledWSGIServer("127.0.0.1", port, flask_app, threads)
+    else:
+        # What app.run() builds: a new thread for every request
+        server = make_server("127.0.0.1", port, flask_app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextlib.contextmanager
+def serve_async(port: int):
+    config = uvicorn.Config(asgi_app, host="127.0.0.1", port=port, log_level="warning", backlog=4096)
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError(f"Async server failed to start on port {port}")
+        time.sleep(0.05)
+    try:
+        yield
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+# --- Load generator ---
+
+def _send(base_url: str, endpoint: str):
+    start = time.perf_counter()
+    try:
+        if endpoint == "query":
+            response = requests.post(
+                f"{base_url}/query",
+                json={"question": "What does the claimed invention do?", "document_id": DOCUMENT_ID},
+                timeout=120,
+            )
+        else:
+            response = requests.get(f"{base_url}/analyze/{DOCUMENT_ID}", timeout=120)
+        ok = response.status_code == 200
+    except requests.RequestException:
+        ok = False
+    return ok, time.perf_counter() - start
+
+
+def _server_thread_count():
+    """Threads in this process that aren't the main thread or the load generator's own."""
+    return sum(
+        1 for thread in threading.enumerate()
+        if thread is not threading.main_thread() and not thread.name.startswith("loadtest")
+    )
+
+
+def run_load(base_url: str, endpoint: str, concurrency: int, total: int, baseline_threads: int):
+    peak_threads = 0
+    done = threading.Event()
+
+    def sample_threads():
+        nonlocal peak_threads
+        while not done.wait(0.01):
+            peak_threads = max(peak_threads, _server_thread_count())
+
+    sampler = threading.Thread(target=sample_threads, name="loadtest-sampler", daemon=True)
+    sampler.start()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="loadtest-client") as clients:
+        start = time.perf_counter()
+        results = list(clients.map(lambda _: _send(base_url, endpoint), range(total)))
+        elapsed = time.perf_counter() - start
+    done.set()
+    sampler.join()
+
+    latencies = sorted(latency for ok, latency in results if ok)
+    errors = sum(1 for ok, _ in results if not ok)
+    return {
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0,
+        "max": latencies[-1] if latencies else 0.0,
+        "errors": errors,
+        "threads": peak_threads - baseline_threads,
+    }
+
+
+def print_report(name: str, stats: dict):
+    print(f"{name}: {stats['elapsed']:7.2f}s total | {stats['throughput']:8.1f} req/s | "
+          f"p50 {stats['p50']:.2f}s | p95 {stats['p95']:.2f}s | max {stats['max']:.2f}s | "
+          f"peak server threads {stats['threads']} | errors {stats['errors']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the sync and async serving modes against fake backends.")
+    parser.add_argument("--mode", choices=["sync", "async", "both"], default="both")
+    parser.add_argument("--endpoint", choices=["query", "analyze"], default="query")
+    parser.add_argument("--concurrency", type=int, default=200, help="Number of concurrent clients.")
+    parser.add_argument("--requests", type=int, default=None, help="Total requests (default: 2x concurrency).")
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds each fake Gemini/embedding call takes.")
+    parser.add_argument("--sync-threads", type=int, default=0,
+                        help="Fixed worker threads for the sync server (default: 0, one thread per request like app.run()).")
+    parser.add_argument("--sync-port", type=int, default=5001)
+    parser.add_argument("--async-port", type=int, default=5002)
+    args = parser.parse_args()
+
+    total = args.requests or args.concurrency * 2
+    install_fakes(args.latency)
+
+    print(f"🚀 {total} x /{args.endpoint} with {args.concurrency} concurrent clients, "
+          f"{args.latency}s per fake backend call")
+
+    # The route handlers and werkzeug log every request; keep them out of the report
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    devnull = open(os.devnull, "w")
+    report = {}
+    baseline_threads = _server_thread_count()
+    sync_name = f"sync ({args.sync_threads} threads)" if args.sync_threads else "sync (app.run, thread per request)"
+
+    if args.mode in ("sync", "both"):
+        with contextlib.redirect_stdout(devnull), serve_sync(args.sync_port, args.sync_threads):
+            report["sync"] = run_load(f"http://127.0.0.1:{args.sync_port}", args.endpoint, args.concurrency,
+                                      total, baseline_threads)
+        print_report(sync_name, report["sync"])
+
+    if args.mode in ("async", "both"):
+        with contextlib.redirect_stdout(devnull), serve_async(args.async_port):
+            report["async"] = run_load(f"http://127.0.0.1:{args.async_port}", args.endpoint, args.concurrency,
+                                       total, baseline_threads)
+        print_report("async (uvicorn)", report["async"])
+
+    devnull.close()
+
+    if "sync" in report and "async" in report and report["sync"]["throughput"]:
+        speedup = report["async"]["throughput"] / report["sync"]["throughput"]
+        print(f"✅ Async mode throughput: {speedup:.1f}x {sync_name}")
+
+    if any(stats["errors"] for stats in report.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
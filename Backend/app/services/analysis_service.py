@@ -2,7 +2,9 @@ from google.generativeai.generative_models import GenerativeModel
 from google.generativeai.client import configure
 from typing import List, Dict, Optional
 from app.services.vector_db.chroma_connector import ChromaConnector
-from app.services.get_embedding_function import get_embedding_function
+from app.services.get_embedding_function import get_embedding_function, embed_documents_async
+from app.services.threadpool import run_blocking
+import asyncio
 import os
 
 # Initialize Chroma connector
@@ -23,45 +25,79 @@ else:
 embedding_fn = get_embedding_function() # Changed
 
 # --- Analysis Logic ---
+# Prompt builders and response parsers are shared by the sync functions below
+# and their *_async counterparts used by the ASGI server.
+
+def _summary_prompt(text: str) -> str:
+    return f"Summarize the following patent proposal in 3-5 sentences:\n{text[:5000]}"
+
+def _novelty_prompt(text: str) -> str:
+    return ("Rate the novelty of this patent on a scale of 0 to 100. "
+            "Consider technical innovation and prior art. "
+            f"Return only the number:\n{text[:3000]}")
+
+def _issues_prompt(text: str) -> str:
+    return ("List 3-5 potential legal, technical, or novelty issues with this patent. "
+            f"Use concise bullet points:\n{text[:4000]}")
+
+def _improvements_prompt(text: str) -> str:
+    return ("Suggest 3-5 specific improvements to strengthen this patent:"
+            f"\n{text[:4000]}")
+
+def _parse_score(response_text: str) -> int:
+    try:
+        return min(100, max(0, int("".join(filter(str.isdigit, response_text.strip())))))
+    except ValueError:
+        return 60  # Fallback score
+
+def _parse_bullets(response_text: str) -> List[str]:
+    return [line.strip("•- ").strip() for line in response_text.strip().split("\n") if line.strip()]
+
+def _format_similar(results) -> List[Dict]:
+    similar = []
+    if results and results.get("documents") and results.get("metadatas") and results.get("distances"):
+        documents = results["documents"][0]  # type: ignore
+        metadatas = results["metadatas"][0]  # type: ignore
+        distances = results["distances"][0]  # type: ignore
+        for doc, meta, distance in zip(documents, metadatas, distances):
+            similarity = max(0, 100 - distance * 100)  # Convert distance to similarity percentage
+            similar.append({
+                "id": meta.get("id", "N/A"),
+                "title": meta.get("title", "Untitled"),
+                "similarity": round(similarity, 2),
+                "date": meta.get("date", "Unknown"),
+                "assignee": meta.get("assignee", "N/A"),
+                "excerpt": doc[:200] + "..." if len(doc) > 200 else doc
+            })
+    return similar
 
 def generate_summary(text: str) -> str:
     """Generate a summary of the patent text."""
     if not model:
         return "Summary generation requires Google API key to be configured."
-    prompt = f"Summarize the following patent proposal in 3-5 sentences:\n{text[:5000]}"
-    response = model.generate_content(prompt)
+    response = model.generate_content(_summary_prompt(text))
     return response.text.strip()
 
 def score_novelty(text: str) -> int:
     """Score the novelty of the patent on a scale of 0-100."""
     if not model:
         return 60  # Fallback score
-    prompt = ("Rate the novelty of this patent on a scale of 0 to 100. "
-             "Consider technical innovation and prior art. "
-             "Return only the number:\n{text[:3000]}")
-    response = model.generate_content(prompt)
-    try:
-        return min(100, max(0, int("".join(filter(str.isdigit, response.text.strip())))))
-    except ValueError:
-        return 60  # Fallback score
+    response = model.generate_content(_novelty_prompt(text))
+    return _parse_score(response.text)
 
 def find_issues(text: str) -> List[str]:
     """Identify potential issues with the patent."""
     if not model:
         return ["API key not configured for detailed analysis"]
-    prompt = ("List 3-5 potential legal, technical, or novelty issues with this patent. "
-             "Use concise bullet points:\n{text[:4000]}")
-    response = model.generate_content(prompt)
-    return [line.strip("•- ").strip() for line in response.text.strip().split("\n") if line.strip()]
+    response = model.generate_content(_issues_prompt(text))
+    return _parse_bullets(response.text)
 
 def suggest_improvements(text: str) -> List[str]:
     """Suggest patent improvements."""
     if not model:
         return ["API key not configured for detailed analysis"]
-    prompt = ("Suggest 3-5 specific improvements to strengthen this patent:"
-             "\n{text[:4000]}")
-    response = model.generate_content(prompt)
-    return [line.strip("•- ").strip() for line in response.text.strip().split("\n") if line.strip()]
+    response = model.generate_content(_improvements_prompt(text))
+    return _parse_bullets(response.text)
 
 def find_similar_patents(text: str, top_k: int = 5) -> List[Dict]:
     """Find similar patents in the database."""
@@ -73,23 +109,26 @@ def find_similar_patents(text: str, top_k: int = 5) -> List[Dict]:
         query_embeddings=query_embedding[0],  # Get the first (and only) embedding
         n_results=top_k
     )
+    return _format_similar(results)
+
+def _fetch_document_chunks(document_id: str):
+    """Fetch all stored chunks for a document (filename_base), or None if it isn't in ChromaDB."""
+    # URL decode the document_id to handle special characters
+    import urllib.parse
+    decoded_document_id = urllib.parse.unquote(document_id)
+    print(f"📄 Analyzing document: {decoded_document_id}")
+    
+    # Query ChromaDB for all chunks matching the document_id (filename_base)
+    results = chroma_connector.collection.get(
+        where={"filename_base": decoded_document_id}
+    )
 
-    similar = []
-    if results and results.get("documents") and results.get("metadatas") and results.get("distances"):
-        documents = results["documents"][0]  # type: ignore
-        metadatas = results["metadatas"][0]  # type: ignore
-        distances = results["distances"][0]  # type: ignore
-        for doc, meta, distance in zip(documents, metadatas, distances):
-            similarity = max(0, 100 - distance * 100)  # Convert distance to similarity percentage
-            similar.append({
-                "id": meta.get("id", "N/A"),
-                "title": meta.get("title", "Untitled"),
-                "similarity": round(similarity, 2),
-                "date": meta.get("date", "Unknown"),
-                "assignee": meta.get("assignee", "N/A"),
-                "excerpt": doc[:200] + "..." if len(doc) > 200 else doc
-            })
-    return similar
+    if not results or not results['documents']:
+        print(f"❌ Document not found: {decoded_document_id}")
+        return None
+    
+    print(f"✅ Found {len(results['documents'])} document chunks")
+    return results
 
 def analyze_patent(document_id: str) -> Optional[Dict]:
     """
@@ -97,21 +136,9 @@ def analyze_patent(document_id: str) -> Optional[Dict]:
     Fetches all chunks for this document, reconstructs its text, and performs analysis.
     """
     try:
-        # URL decode the document_id to handle special characters
-        import urllib.parse
-        decoded_document_id = urllib.parse.unquote(document_id)
-        print(f"📄 Analyzing document: {decoded_document_id}")
-        
-        # Query ChromaDB for all chunks matching the document_id (filename_base)
-        results = chroma_connector.collection.get(
-            where={"filename_base": decoded_document_id}
-        )
-
-        if not results or not results['documents']:
-            print(f"❌ Document not found: {decoded_document_id}")
+        results = _fetch_document_chunks(document_id)
+        if not results:
             return None
-        
-        print(f"✅ Found {len(results['documents'])} document chunks")
 
         # Sort documents by original page and chunk id if possible, though simple concatenation is often sufficient.
         # The chunk_id was "source_full_path:page:chunk_index".
@@ -147,4 +174,77 @@ def analyze_patent(document_id: str) -> Optional[Dict]:
 
     # except Exception as e:
     #     print(f"Error analyzing document: {e}")
-    #     return None
\ No newline at end of file
+    #     return None
+
+
+# --- Async variants used by the ASGI server (app/asgi.py) ---
+
+async def generate_summary_async(text: str) -> str:
+    if not model:
+        return "Summary generation requires Google API key to be configured."
+    response = await model.generate_content_async(_summary_prompt(text))
+    return response.text.strip()
+
+async def score_novelty_async(text: str) -> int:
+    if not model:
+        return 60  # Fallback score
+    response = await model.generate_content_async(_novelty_prompt(text))
+    return _parse_score(response.text)
+
+async def find_issues_async(text: str) -> List[str]:
+    if not model:
+        return ["API key not configured for detailed analysis"]
+    response = await model.generate_content_async(_issues_prompt(text))
+    return _parse_bullets(response.text)
+
+async def suggest_improvements_async(text: str) -> List[str]:
+    if not model:
+        return ["API key not configured for detailed analysis"]
+    response = await model.generate_content_async(_improvements_prompt(text))
+    return _parse_bullets(response.text)
+
+async def find_similar_patents_async(text: str, top_k: int = 5) -> List[Dict]:
+    query_embedding = await embed_documents_async([text])
+    results = await run_blocking(
+        chroma_connector.collection.query,
+        query_embeddings=query_embedding[0],
+        n_results=top_k
+    )
+    return _format_similar(results)
+
+async def analyze_patent_async(document_id: str) -> Optional[Dict]:
+    """
+    Async version of analyze_patent. Chroma lookups run on the thread pool and the
+    Gemini and embedding calls are awaited concurrently instead of one after another.
+    """
+    try:
+        results = await run_blocking(_fetch_document_chunks, document_id)
+        if not results:
+            return None
+
+        full_text = "\n\n".join(results['documents'])
+        first_chunk_metadata = results['metadatas'][0] if results['metadatas'] else {}
+
+        print("🤖 Generating analysis...")
+
+        summary, novelty, issues, recommendations, similar = await asyncio.gather(
+            generate_summary_async(full_text),
+            score_novelty_async(full_text),
+            find_issues_async(full_text),
+            suggest_improvements_async(full_text),
+            find_similar_patents_async(full_text),
+        )
+
+        return {
+            "title": first_chunk_metadata.get("title_pdf", document_id),
+            "date": first_chunk_metadata.get("creation_date_pdf", "Unknown Date"),
+            "applicant": first_chunk_metadata.get("author_pdf", "Unknown Applicant"),
+            "summary": summary,
+            "noveltyScore": novelty,
+            "potentialIssues": issues,
+            "recommendations": recommendations,
+            "similarPatents": similar,
+        }
+    except Exception as e:
+        print(f"Error analyzing document {document_id}: {e}")
+        return None
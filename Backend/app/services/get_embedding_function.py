@@ -1,9 +1,13 @@
 import os
 from dotenv import load_dotenv
+import google.generativeai as genai
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 
 # Load environment variables from .env file
 load_dotenv()
+
+EMBEDDING_MODEL = "models/text-embedding-004"
+
 def get_embedding_function():
     """
     Returns Google Gemini embedding function.
@@ -15,4 +19,24 @@ def get_embedding_function():
     # The GoogleGenerativeAIEmbeddings class will internally use this environment variable
     # or you can pass it explicitly: GoogleGenerativeAIEmbeddings(model="models/text-embedding-004", google_api_key=api_key)
     # Langchain typically checks os.environ["GOOGLE_API_KEY"] automatically.
-    return GoogleGenerativeAIEmbeddings(model="models/text-embedding-004")
+    return GoogleGenerativeAIEmbeddings(model=EMBEDDING_MODEL)
+
+
+# GoogleGenerativeAIEmbeddings has no native async methods: its aembed_* fall back to
+# asyncio's default executor (min(32, cpu + 4) threads), which would cap the async
+# server's concurrency. These helpers call the google.generativeai async API directly,
+# using the same model and task types LangChain uses for embed_query/embed_documents.
+
+async def embed_query_async(text: str):
+    """Embed a search query without blocking the event loop."""
+    result = await genai.embed_content_async(
+        model=EMBEDDING_MODEL, content=text, task_type="retrieval_query"
+    )
+    return result["embedding"]
+
+async def embed_documents_async(texts):
+    """Embed a list of texts without blocking the event loop."""
+    result = await genai.embed_content_async(
+        model=EMBEDDING_MODEL, content=texts, task_type="retrieval_document"
+    )
+    return result["embedding"]
@@ -0,0 +1,27 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# ChromaDB only has a synchronous API. The async server hands those calls to this pool
+# so they never block the event loop.
+CHROMA_THREADPOOL_SIZE = int(os.environ.get("CHROMA_THREADPOOL_SIZE", "32"))
+
+# PDF ingestion (load → split → embed → store) is long and makes sync embedding calls.
+# It gets its own small pool so a burst of uploads can't starve /query and /analyze.
+INGEST_THREADPOOL_SIZE = int(os.environ.get("INGEST_THREADPOOL_SIZE", "2"))
+
+_executor = ThreadPoolExecutor(max_workers=CHROMA_THREADPOOL_SIZE, thread_name_prefix="chroma")
+_ingest_executor = ThreadPoolExecutor(max_workers=INGEST_THREADPOOL_SIZE, thread_name_prefix="ingest")
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking call on the shared thread pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+async def run_ingestion(func, *args, **kwargs):
+    """Run a PDF ingestion job on the dedicated ingestion pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_ingest_executor, functools.partial(func, *args, **kwargs))
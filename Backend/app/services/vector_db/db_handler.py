@@ -1,8 +1,12 @@
 import os
+import threading
+from google.generativeai.client import configure
+from google.generativeai.generative_models import GenerativeModel
 from langchain.prompts import ChatPromptTemplate
 from langchain_chroma import Chroma
 from langchain_google_genai import GoogleGenerativeAI
-from app.services.get_embedding_function import get_embedding_function
+from app.services.get_embedding_function import get_embedding_function, embed_query_async
+from app.services.threadpool import run_blocking
 import chromadb
 from langchain_chroma import Chroma
 
@@ -35,49 +39,37 @@ Answer the question based only on the following context:
 Answer the question based on the above context: {question}
 """
 
-def query_vector_db(query_text: str, document_id: str = None):
-    # Set up ChromaDB with embedding
-    embedding_function = get_embedding_function()
-    db = Chroma(persist_directory=CHROMA_PATH, embedding_function=embedding_function)
+GEMINI_MODEL = "models/gemini-2.0-flash"
+# LangChain's GoogleGenerativeAI default, set explicitly so both serving modes sample alike
+GEMINI_TEMPERATURE = 0.7
 
-    # Similarity search with document filtering if provided
-    if document_id:
-        # URL decode the document_id to handle special characters
-        import urllib.parse
-        decoded_document_id = urllib.parse.unquote(document_id)
-        print(f"🔍 Searching within document: '{decoded_document_id}'")
-        
-        # Filter by the specific document
-        results = db.similarity_search_with_score(
-            query_text, 
-            k=5,
-            filter={"filename_base": decoded_document_id}
-        )
-    else:
-        # General search across all documents
+def _no_results_answer():
+    return {
+        "answer": "No relevant information found in the database.",
+        "sources": []
+    }
+
+def _document_filter(document_id: str = None):
+    """Return the Chroma metadata filter for a document, or None to search everything."""
+    if not document_id:
         print(f"🔍 Searching across all documents")
-        results = db.similarity_search_with_score(query_text, k=5)
+        return None
 
-    if not results:
-        print("⚠️ No relevant information found.")
-        return {
-            "answer": "No relevant information found in the database.",
-            "sources": []
-        }
-    
-    print(f"🤖 Generating AI response...")
-    
+    # URL decode the document_id to handle special characters
+    import urllib.parse
+    decoded_document_id = urllib.parse.unquote(document_id)
+    print(f"🔍 Searching within document: '{decoded_document_id}'")
+    return {"filename_base": decoded_document_id}
+
+def _build_prompt(query_text: str, results):
     # Prepare context
     context_text = "\n\n---\n\n".join([doc.page_content for doc, _ in results])
 
     # Format prompt
     prompt_template = ChatPromptTemplate.from_template(PROMPT_TEMPLATE)
-    prompt = prompt_template.format(context=context_text, question=query_text)
-
-    # Generate answer using Gemini
-    model = GoogleGenerativeAI(model="models/gemini-2.0-flash")
-    response_text = model.invoke(prompt)
+    return prompt_template.format(context=context_text, question=query_text)
 
+def _format_answer(response_text, results):
     # Extract source IDs
     sources = [doc.metadata.get("id", "Unknown") for doc, _ in results]
 
@@ -86,3 +78,85 @@ def query_vector_db(query_text: str, document_id: str = None):
         "answer": response_text,
         "sources": sources
     }
+
+def query_vector_db(query_text: str, document_id: str = None):
+    # Set up ChromaDB with embedding
+    embedding_function = get_embedding_function()
+    db = Chroma(persist_directory=CHROMA_PATH, embedding_function=embedding_function)
+
+    # Similarity search, filtered to the document if one was provided
+    results = db.similarity_search_with_score(
+        query_text,
+        k=5,
+        filter=_document_filter(document_id)
+    )
+
+    if not results:
+        print("⚠️ No relevant information found.")
+        return _no_results_answer()
+    
+    print(f"🤖 Generating AI response...")
+    prompt = _build_prompt(query_text, results)
+
+    # Generate answer using Gemini
+    model = GoogleGenerativeAI(model=GEMINI_MODEL, temperature=GEMINI_TEMPERATURE)
+    response_text = model.invoke(prompt)
+
+    return _format_answer(response_text, results)
+
+
+# --- Async variant used by the ASGI server (app/asgi.py) ---
+# LangChain's GoogleGenerativeAI and GoogleGenerativeAIEmbeddings only have sync
+# implementations, so this path calls google.generativeai's native async API instead.
+
+def _response_text(response):
+    """
+    Extract the answer the way GoogleGenerativeAI.invoke does: join the first candidate's
+    parts. A blocked or empty candidate gives "" instead of response.text's ValueError.
+    """
+    return "".join(part.text for part in response.candidates[0].content.parts)
+
+_async_clients = None
+_async_clients_lock = threading.Lock()
+
+def init_async_clients():
+    """
+    Build the Chroma handle and Gemini model once and reuse them.
+    Opening the persistent Chroma store touches disk, so call this off the event loop
+    (asgi.py does it from a before_serving hook via run_blocking).
+    """
+    global _async_clients
+    with _async_clients_lock:
+        if _async_clients is None:
+            configure(api_key=os.environ.get("GOOGLE_API_KEY"))
+            db = Chroma(persist_directory=CHROMA_PATH, embedding_function=get_embedding_function())
+            model = GenerativeModel(
+                GEMINI_MODEL,
+                generation_config={"temperature": GEMINI_TEMPERATURE, "candidate_count": 1}
+            )
+            _async_clients = (db, model)
+    return _async_clients
+
+async def query_vector_db_async(query_text: str, document_id: str = None):
+    """Same as query_vector_db, but awaits the network calls and runs Chroma on the thread pool."""
+    db, model = _async_clients or await run_blocking(init_async_clients)
+    search_filter = _document_filter(document_id)
+
+    # Embed the question asynchronously, then hand only the local vector search to Chroma
+    query_embedding = await embed_query_async(query_text)
+    results = await run_blocking(
+        db.similarity_search_by_vector_with_relevance_scores,
+        query_embedding,
+        k=5,
+        filter=search_filter
+    )
+
+    if not results:
+        print("⚠️ No relevant information found.")
+        return _no_results_answer()
+
+    print(f"🤖 Generating AI response...")
+    prompt = _build_prompt(query_text, results)
+    response = await model.generate_content_async(prompt)
+
+    return _format_answer(_response_text(response), results)